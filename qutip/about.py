@@ -8,67 +8,71 @@ import os
 import platform
 import numpy
 import scipy
-import inspect
 import qutip
 from qutip.settings import _blas_info, settings
 
 
+def _package_version(name):
+    """
+    Return the installed version of the package `name`, or 'None' if it is
+    not installed. The version is read from the package metadata, so the
+    package itself is not imported.
+    """
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return 'None'
+
+
 def about():
     """
     About box for QuTiP. Gives version numbers for QuTiP, NumPy, SciPy, Cython,
     and MatPlotLib.
     """
-    print("")
-    print("QuTiP: Quantum Toolbox in Python")
-    print("================================")
-    print("Copyright (c) QuTiP team 2011 and later.")
-    print(
-        "Current admin team: Alexander Pitchford, "
-        "Nathan Shammah, Shahnawaz Ahmed, Neill Lambert, Eric Giguère, "
-        "Boxi Li, Jake Lishman, Simon Cross and Asier Galicia."
-    )
-    print(
-        "Board members: Daniel Burgarth, Robert Johansson, Anton F. Kockum, "
-        "Franco Nori and Will Zeng."
-    )
-    print("Original developers: R. J. Johansson & P. D. Nation.")
-    print("Previous lead developers: Chris Granade & A. Grimsmo.")
-    print("Currently developed through wide collaboration. "
-          "See https://github.com/qutip for details.")
-    print("")
-    print("QuTiP Version:      %s" % qutip.__version__)
-    print("Numpy Version:      %s" % numpy.__version__)
-    print("Scipy Version:      %s" % scipy.__version__)
-    try:
-        import Cython
-        cython_ver = Cython.__version__
-    except ImportError:
-        cython_ver = 'None'
-    print("Cython Version:     %s" % cython_ver)
     try:
         import matplotlib
         matplotlib_ver = matplotlib.__version__
     except ImportError:
         matplotlib_ver = 'None'
-    print("Matplotlib Version: %s" % matplotlib_ver)
-    print("Python Version:     %d.%d.%d" % sys.version_info[0:3])
-    print("Number of CPUs:     %s" % settings.num_cpus)
-    print("BLAS Info:          %s" % _blas_info())
-    # print("OPENMP Installed:   %s" % str(qutip.settings.has_openmp))
-    print("INTEL MKL Ext:      %s" % str(settings.has_mkl))
-    print("Platform Info:      %s (%s)" % (platform.system(),
-                                           platform.machine()))
-    qutip_install_path = os.path.dirname(inspect.getsourcefile(qutip))
-    print("Installation path:  %s" % qutip_install_path)
 
-    # citation
     longbar = "=" * 80
-    cite_msg = "For your convenience a bibtex reference can be easily"
-    cite_msg += " generated using `qutip.cite()`"
-    print(longbar)
-    print("Please cite QuTiP in your publication.")
-    print(longbar)
-    print(cite_msg)
+    lines = [
+        "",
+        "QuTiP: Quantum Toolbox in Python",
+        "================================",
+        "Copyright (c) QuTiP team 2011 and later.",
+        "Current admin team: Alexander Pitchford, "
+        "Nathan Shammah, Shahnawaz Ahmed, Neill Lambert, Eric Giguère, "
+        "Boxi Li, Jake Lishman, Simon Cross and Asier Galicia.",
+        "Board members: Daniel Burgarth, Robert Johansson, Anton F. Kockum, "
+        "Franco Nori and Will Zeng.",
+        "Original developers: R. J. Johansson & P. D. Nation.",
+        "Previous lead developers: Chris Granade & A. Grimsmo.",
+        "Currently developed through wide collaboration. "
+        "See https://github.com/qutip for details.",
+        "",
+        "QuTiP Version:      %s" % qutip.__version__,
+        "Numpy Version:      %s" % numpy.__version__,
+        "Scipy Version:      %s" % scipy.__version__,
+        "Cython Version:     %s" % _package_version("cython"),
+        "Matplotlib Version: %s" % matplotlib_ver,
+        "Python Version:     %d.%d.%d" % sys.version_info[0:3],
+        "Number of CPUs:     %s" % settings.num_cpus,
+        "BLAS Info:          %s" % _blas_info(),
+        # "OPENMP Installed:   %s" % str(qutip.settings.has_openmp),
+        "INTEL MKL Ext:      %s" % str(settings.has_mkl),
+        "Platform Info:      %s (%s)" % (platform.system(),
+                                         platform.machine()),
+        "Installation path:  %s" % os.path.dirname(qutip.__file__),
+        # citation
+        longbar,
+        "Please cite QuTiP in your publication.",
+        longbar,
+        "For your convenience a bibtex reference can be easily"
+        " generated using `qutip.cite()`",
+    ]
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -13,20 +13,44 @@ __all__ = ['Distribution', 'WignerDistribution', 'QDistribution',
            'HarmonicOscillatorWaveFunction',
            'HarmonicOscillatorProbabilityFunction']
 
+import functools
+
 import numpy as np
 from numpy import pi, exp, sqrt
 
-from scipy.special import hermite, factorial
+from . import isket, ket2dm
 
-from . import isket, ket2dm, state_number_index
-from .wigner import wigner, qfunc
+# matplotlib is only needed by the visualization methods, so it is imported
+# on first use by _require_mpl rather than when this module is loaded.
+mpl = None
+plt = None
+Axes3D = None
 
-try:
-    import matplotlib as mpl
-    import matplotlib.pyplot as plt
-    from mpl_toolkits.mplot3d import Axes3D
-except:
-    pass
+
+def _require_mpl():
+    """
+    Import matplotlib on first call and cache the modules at module scope.
+    """
+    global mpl, plt, Axes3D
+    if mpl is None:
+        import matplotlib
+        import matplotlib.pyplot
+        from mpl_toolkits.mplot3d import Axes3D as _Axes3D
+        plt = matplotlib.pyplot
+        Axes3D = _Axes3D
+        mpl = matplotlib
+    return mpl, plt, Axes3D
+
+
+def _absmax(a):
+    """
+    Return the largest absolute value in `a`. For real data this uses two
+    reductions and does not allocate abs(a).
+    """
+    a = np.asarray(a)
+    if np.isrealobj(a):
+        return max(a.max(), -a.min())
+    return np.abs(a).max()
 
 
 class Distribution:
@@ -120,6 +144,7 @@ class Distribution:
     def visualize_2d_colormap(self, fig=None, ax=None, figsize=(8, 6),
                               colorbar=True, cmap=None,
                               show_xlabel=True, show_ylabel=True):
+        mpl, plt, _ = _require_mpl()
 
         if not fig and not ax:
             fig, ax = plt.subplots(1, 1, figsize=figsize)
@@ -127,7 +152,7 @@ class Distribution:
         if cmap is None:
             cmap = mpl.cm.get_cmap('RdBu')
 
-        lim = abs(self.data).max()
+        lim = _absmax(self.data)
 
         cf = ax.contourf(self.xvecs[0], self.xvecs[1], self.data, 100,
                          norm=mpl.colors.Normalize(-lim, lim),
@@ -146,6 +171,7 @@ class Distribution:
     def visualize_2d_surface(self, fig=None, ax=None, figsize=(8, 6),
                              colorbar=True, cmap=None,
                              show_xlabel=True, show_ylabel=True):
+        mpl, plt, Axes3D = _require_mpl()
 
         if not fig and not ax:
             fig = plt.figure(figsize=figsize)
@@ -154,9 +180,9 @@ class Distribution:
         if cmap is None:
             cmap = mpl.cm.get_cmap('RdBu')
 
-        lim = abs(self.data).max()
+        lim = _absmax(self.data)
 
-        X, Y = np.meshgrid(self.xvecs[0], self.xvecs[1])
+        X, Y = np.meshgrid(self.xvecs[0], self.xvecs[1], sparse=True)
         s = ax.plot_surface(X, Y, self.data,
                             norm=mpl.colors.Normalize(-lim, lim),
                             rstride=5, cstride=5, cmap=cmap, lw=0.1)
@@ -173,6 +199,7 @@ class Distribution:
 
     def visualize_1d(self, fig=None, ax=None, figsize=(8, 6),
                      show_xlabel=True, show_ylabel=True):
+        _, plt, _ = _require_mpl()
 
         if not fig and not ax:
             fig, ax = plt.subplots(1, 1, figsize=figsize)
@@ -246,6 +273,7 @@ class WignerDistribution(Distribution):
             self.update(rho)
 
     def update(self, rho):
+        from .wigner import wigner
 
         self.data = wigner(rho, self.xvecs[0], self.xvecs[1])
 
@@ -263,6 +291,7 @@ class QDistribution(Distribution):
             self.update(rho)
 
     def update(self, rho):
+        from .wigner import qfunc
 
         self.data = qfunc(rho, self.xvecs[0], self.xvecs[1])
 
@@ -297,62 +326,103 @@ class TwoModeQuadratureCorrelation(Distribution):
         calculate probability distribution for quadrature measurement
         outcomes given a two-mode wavefunction
         """
+        N1, N2 = psi.dims[0]
+        # The state |n1, n2> has index n1 * N2 + n2, so the amplitudes
+        # C[n1, n2] are a plain reshape of the state vector.
+        C = psi.full().reshape(N1, N2)
 
-        X1, X2 = np.meshgrid(self.xvecs[0], self.xvecs[1])
-
-        p = np.zeros((len(self.xvecs[0]), len(self.xvecs[1])), dtype=complex)
-        N = psi.dims[0][0]
+        K1 = _cached_quadrature_kernels(tuple(self.xvecs[0]),
+                                        self.theta1, N1)
+        K2 = _cached_quadrature_kernels(tuple(self.xvecs[1]),
+                                        self.theta2, N2)
 
-        for n1 in range(N):
-            kn1 = exp(-1j * self.theta1 * n1) / \
-                sqrt(sqrt(pi) * 2 ** n1 * factorial(n1)) * \
-                exp(-X1 ** 2 / 2.0) * np.polyval(hermite(n1), X1)
+        # p[x2, x1] = sum_{n1, n2} C[n1, n2] K1[n1, x1] K2[n2, x2]
+        p = K2.T @ C.T @ K1
 
-            for n2 in range(N):
-                kn2 = exp(-1j * self.theta2 * n2) / \
-                    sqrt(sqrt(pi) * 2 ** n2 * factorial(n2)) * \
-                    exp(-X2 ** 2 / 2.0) * np.polyval(hermite(n2), X2)
-                i = state_number_index([N, N], [n1, n2])
-                p += kn1 * kn2 * psi.data[i, 0]
-
-        self.data = abs(p) ** 2
+        self.data = p.real ** 2 + p.imag ** 2
 
     def update_rho(self, rho):
         """
         calculate probability distribution for quadrature measurement
         outcomes given a two-mode density matrix
         """
+        N1, N2 = rho.dims[0]
+        R = rho.full().reshape(N1, N2, N1, N2)
+
+        K1 = _cached_quadrature_kernels(tuple(self.xvecs[0]),
+                                        self.theta1, N1)
+        K2 = _cached_quadrature_kernels(tuple(self.xvecs[1]),
+                                        self.theta2, N2)
 
-        X1, X2 = np.meshgrid(self.xvecs[0], self.xvecs[1])
+        M1 = (K1[:, None, :] * K1.conj()[None, :, :]).reshape(N1 * N1, -1)
+        M2 = (K2[:, None, :] * K2.conj()[None, :, :]).reshape(N2 * N2, -1)
 
-        p = np.zeros((len(self.xvecs[0]), len(self.xvecs[1])), dtype=complex)
-        N = rho.dims[0][0]
+        # p[x2, x1] = sum_{n1, n2, p1, p2}
+        #     M1[(n1, p1), x1] M2[(n2, p2), x2] R[n1, n2, p1, p2]
+        R = R.transpose(1, 3, 0, 2).reshape(N2 * N2, N1 * N1)
+        p = M2.T @ R @ M1
 
-        M1 = np.zeros(
-            (N, N, len(self.xvecs[0]), len(self.xvecs[1])), dtype=complex)
-        M2 = np.zeros(
-            (N, N, len(self.xvecs[0]), len(self.xvecs[1])), dtype=complex)
+        # The distribution of a Hermitian rho is real, so only the real part
+        # is kept and the data is stored as float64 like in update_psi.
+        self.data = p.real
 
-        for m in range(N):
-            for n in range(N):
-                M1[m, n] = exp(-1j * self.theta1 * (m - n)) / \
-                    sqrt(pi * 2 ** (m + n) * factorial(n) * factorial(m)) * \
-                    exp(-X1 ** 2) * np.polyval(
-                        hermite(m), X1) * np.polyval(hermite(n), X1)
-                M2[m, n] = exp(-1j * self.theta2 * (m - n)) / \
-                    sqrt(pi * 2 ** (m + n) * factorial(n) * factorial(m)) * \
-                    exp(-X2 ** 2) * np.polyval(
-                        hermite(m), X2) * np.polyval(hermite(n), X2)
 
-        for n1 in range(N):
-            for n2 in range(N):
-                i = state_number_index([N, N], [n1, n2])
-                for p1 in range(N):
-                    for p2 in range(N):
-                        j = state_number_index([N, N], [p1, p2])
-                        p += M1[n1, p1] * M2[n2, p2] * rho.data[i, j]
+@functools.lru_cache(maxsize=8)
+def _cached_quadrature_kernels(x, theta, N):
+    """
+    Memoized version of _quadrature_kernels for parameter scans that update
+    a distribution with many states on the same grid. `x` must be a tuple
+    so that it can be hashed; the returned array is read-only.
+    """
+    K = _quadrature_kernels(np.array(x), theta, N)
+    K.setflags(write=False)
+    return K
 
-        self.data = p
+
+def _quadrature_kernels(X, theta, N):
+    """
+    Return the array of quadrature wavefunctions exp(-i theta n) <x|n>
+    evaluated at the points X for n = 0, ..., N-1, stacked along the first
+    axis.
+    """
+    n = np.arange(N)
+    prefactor = exp(-1j * theta * n) * _hermite_normalization(N) / \
+        sqrt(sqrt(pi))
+    # Apply the Gaussian envelope in place on the real Hermite table so that
+    # the only (N, ...) complex array allocated is the returned one.
+    K = _hermite_table(X, N)
+    K *= exp(-X ** 2 / 2.0)
+    return prefactor.reshape((N,) + (1,) * np.ndim(X)) * K
+
+
+def _hermite_normalization(N):
+    """
+    Return the factors 1 / sqrt(2**n n!) for n = 0, ..., N-1. They are built
+    with the recurrence c_n = c_{n-1} / sqrt(2 n), so no factorials are
+    formed and large n does not overflow.
+    """
+    c = np.ones(N)
+    c[1:] = np.cumprod(1.0 / np.sqrt(2.0 * np.arange(1, N)))
+    return c
+
+
+def _hermite_table(x, N):
+    """
+    Return the physicists' Hermite polynomials H_0, ..., H_{N-1} evaluated
+    at x, stacked along the first axis. The table is filled with the
+    three-term recurrence H_{n+1}(x) = 2 x H_n(x) - 2 n H_{n-1}(x), which
+    is cheaper and numerically better behaved than evaluating the monomial
+    coefficients of each polynomial.
+    """
+    x = np.asarray(x, dtype=float)
+    H = np.empty((N,) + x.shape)
+    if N > 0:
+        H[0] = 1.0
+    if N > 1:
+        H[1] = 2.0 * x
+    for n in range(1, N - 1):
+        H[n + 1] = 2.0 * x * H[n] - 2.0 * n * H[n - 1]
+    return H
 
 
 class HarmonicOscillatorWaveFunction(Distribution):
@@ -371,17 +441,13 @@ class HarmonicOscillatorWaveFunction(Distribution):
         Calculate the wavefunction for the given state of an harmonic
         oscillator
         """
-
-        self.data = np.zeros(len(self.xvecs[0]), dtype=complex)
         N = psi.shape[0]
+        # The quadrature kernels at theta = 0 are
+        # pi**(-1/4) / sqrt(2**n n!) exp(-x**2 / 2) H_n(x), so only the
+        # omega-dependent prefactor needs to be applied here.
+        K = _cached_quadrature_kernels(tuple(self.xvecs[0]), 0.0, N)
 
-        for n in range(N):
-            k = pow(self.omega / pi, 0.25) / \
-                sqrt(2 ** n * factorial(n)) * \
-                exp(-self.xvecs[0] ** 2 / 2.0) * \
-                np.polyval(hermite(n), self.xvecs[0])
-
-            self.data += k * psi.data[n, 0]
+        self.data = pow(self.omega, 0.25) * (psi.full()[:, 0] @ K)
 
 
 class HarmonicOscillatorProbabilityFunction(Distribution):
@@ -400,23 +466,11 @@ class HarmonicOscillatorProbabilityFunction(Distribution):
         Calculate the probability function for the given state of an harmonic
         oscillator (as density matrix)
         """
-
         if isket(rho):
             rho = ket2dm(rho)
 
-        self.data = np.zeros(len(self.xvecs[0]), dtype=complex)
         M, N = rho.shape
+        K = _cached_quadrature_kernels(tuple(self.xvecs[0]), 0.0, max(M, N))
 
-        for m in range(M):
-            k_m = pow(self.omega / pi, 0.25) / \
-                sqrt(2 ** m * factorial(m)) * \
-                exp(-self.xvecs[0] ** 2 / 2.0) * \
-                np.polyval(hermite(m), self.xvecs[0])
-
-            for n in range(N):
-                k_n = pow(self.omega / pi, 0.25) / \
-                    sqrt(2 ** n * factorial(n)) * \
-                    exp(-self.xvecs[0] ** 2 / 2.0) * \
-                    np.polyval(hermite(n), self.xvecs[0])
-
-                self.data += np.conjugate(k_n) * k_m * rho.data[m, n]
+        self.data = pow(self.omega, 0.5) * np.einsum(
+            'mx,mn,nx->x', K[:M], rho.full(), K[:N].conj())
@@ -2,6 +2,7 @@
 This module contains settings for the QuTiP graphics, multiprocessing, and
 tidyup functionality, etc.
 """
+import functools
 import os
 import sys
 from ctypes import cdll
@@ -11,6 +12,7 @@ import numpy as np
 __all__ = ['settings']
 
 
+@functools.lru_cache(maxsize=1)
 def _blas_info():
     config = np.__config__
     if hasattr(config, 'blas_ilp64_opt_info'):
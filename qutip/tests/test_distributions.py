@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.special import eval_hermite, factorial
+
+import qutip
+from qutip.distributions import TwoModeQuadratureCorrelation
+
+
+def _fock_probability(n, x):
+    """Probability density |<x|n>|^2 of the n-th harmonic oscillator state."""
+    psi = (np.exp(-x**2 / 2) * eval_hermite(n, x)
+           / np.sqrt(np.sqrt(np.pi) * 2**n * factorial(n)))
+    return np.abs(psi)**2
+
+
+class TestTwoModeQuadratureCorrelation:
+    @pytest.mark.parametrize(['n1', 'n2'], [(0, 0), (1, 2), (3, 0)])
+    @pytest.mark.parametrize(['theta1', 'theta2'], [(0, 0), (0.3, -1.2)])
+    def test_fock_product_state(self, n1, n2, theta1, theta2):
+        N = 4
+        psi = qutip.tensor(qutip.basis(N, n1), qutip.basis(N, n2))
+        dist = TwoModeQuadratureCorrelation(psi, theta1=theta1, theta2=theta2,
+                                            steps=31)
+        expected = np.outer(_fock_probability(n2, dist.xvecs[1]),
+                            _fock_probability(n1, dist.xvecs[0]))
+        assert_allclose(dist.data, expected, atol=1e-12)
+
+    @pytest.mark.parametrize(['theta1', 'theta2'], [(0, 0), (0.7, 2.1)])
+    def test_ket_and_density_matrix_agree(self, theta1, theta2):
+        N = 3
+        psi = qutip.rand_ket([N, N], seed=1)
+        from_ket = TwoModeQuadratureCorrelation(psi, theta1=theta1,
+                                                theta2=theta2, steps=21)
+        from_dm = TwoModeQuadratureCorrelation(psi.proj(), theta1=theta1,
+                                               theta2=theta2, steps=21)
+        assert from_ket.data.dtype == np.float64
+        assert from_dm.data.dtype == np.float64
+        assert_allclose(from_dm.data, from_ket.data, atol=1e-12)
+
+    def test_unequal_mode_dimensions(self):
+        psi = qutip.tensor(qutip.basis(3, 2), qutip.basis(5, 4))
+        for state in [psi, psi.proj()]:
+            dist = TwoModeQuadratureCorrelation(state, steps=21)
+            expected = np.outer(_fock_probability(4, dist.xvecs[1]),
+                                _fock_probability(2, dist.xvecs[0]))
+            assert_allclose(dist.data, expected, atol=1e-12)
+
+    def test_normalisation(self):
+        N = 6
+        psi = qutip.tensor(qutip.coherent(N, 0.3), qutip.coherent(N, -0.2j))
+        dist = TwoModeQuadratureCorrelation(psi, extent=[[-6, 6], [-6, 6]],
+                                            steps=121)
+        dx1 = dist.xvecs[0][1] - dist.xvecs[0][0]
+        dx2 = dist.xvecs[1][1] - dist.xvecs[1][0]
+        assert np.sum(dist.data) * dx1 * dx2 == pytest.approx(1, abs=1e-6)
+
+
+class TestHarmonicOscillator:
+    @pytest.mark.parametrize('n', [0, 1, 4, 9])
+    def test_fock_state(self, n):
+        psi = qutip.basis(12, n)
+        wavefunction = qutip.HarmonicOscillatorWaveFunction(psi, steps=51)
+        probability = qutip.HarmonicOscillatorProbabilityFunction(psi,
+                                                                  steps=51)
+        expected = _fock_probability(n, wavefunction.xvecs[0])
+        assert_allclose(np.abs(wavefunction.data)**2, expected, atol=1e-12)
+        assert_allclose(probability.data, expected, atol=1e-12)